@@ -1,165 +1,211 @@
 import json
+import logging
+import os
 import random
+import threading
 import time
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 
-from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update
-import dash_bootstrap_components as dbc
+_startup_t0 = time.perf_counter()
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger("guess_territory")
+
+# Production boots set DASH_DEBUG=false (see Procfile) to run without the reloader
+DEBUG = os.environ.get("DASH_DEBUG", "true").lower() == "true"
+# The reloader parent only spawns the serving child, so it skips warm-up and logging
+_RELOADER_PARENT = __name__ == "__main__" and DEBUG and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+
+# Per-phase startup durations in seconds, logged as each phase finishes.
+startup_timings = {}
+
+
+@contextmanager
+def timed_phase(name):
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = time.perf_counter() - t
+        if not _RELOADER_PARENT:
+            logger.info("startup phase %-22s %7.1f ms", name, startup_timings[name] * 1000)
+
+
+with timed_phase("import dash"):
+    from dash import Dash, dcc, html, Input, Output, State, callback_context, no_update
+    import dash_bootstrap_components as dbc
 
 ###############################################################################
-# 1) LOAD DATA
+# 1) LOAD DATA (lazily, shared by warm-up and callbacks)
 ###############################################################################
-with open("meere_meeresteile_und_seen.json", "r", encoding="utf-8") as f:
-    meere_data = json.load(f)
-with open("fluesse.json", "r", encoding="utf-8") as f:
-    fluesse_data = json.load(f)
-with open("inseln_inselgruppen.json", "r", encoding="utf-8") as f:
-    inseln_data = json.load(f)
-with open("gebirge.json", "r", encoding="utf-8") as f:
-    gebirge_data = json.load(f)
-
-# Already existing "forgotten.json"
-with open("forgotten.json", "r", encoding="utf-8") as f:
-    forgotten_data = json.load(f)
-
-# NEW: Load forgotten2.json
-with open("forgotten2.json", "r", encoding="utf-8") as f:
-    forgotten2_data = json.load(f)
-
-territory_data = {
-    "gewässer": {
-        "meere_meeresteile_und_seen": meere_data,
-        "fluesse": fluesse_data,
-        "inseln_inselgruppen": inseln_data,
-        "gebirge": gebirge_data,
-        "forgotten": forgotten_data,
-        "forgotten2": forgotten2_data
-    }
-}
+# (category label, JSON file) in display order
+CATEGORY_FILES = [
+    ("Meere, Meeresteile und Seen", "meere_meeresteile_und_seen.json"),
+    ("Flüsse", "fluesse.json"),
+    ("Inseln/Inselgruppen", "inseln_inselgruppen.json"),
+    ("Gebirge", "gebirge.json"),
+    ("Vergessenes", "forgotten.json"),
+    ("Vergessenes2", "forgotten2.json"),
+]
+CATEGORIES = [cat for cat, _ in CATEGORY_FILES]
+
+# Background pool for the figure warm-up
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="warmup")
+_data_lock = threading.Lock()
+_data = None
+_warm_done = threading.Event()
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 
 ###############################################################################
-# 2) BUILD DATAFRAME
+# 2) BUILD INDEXES
 ###############################################################################
-data_rows = []
-
-def add_category(cat_name, cat_data):
+def _build_rows(cat_name, cat_data):
     feats = cat_data.get("data", [])
     coords = cat_data.get("coords", {})
+    rows = []
     for feat in feats:
         info = coords.get(feat, {})
-        geom_type = info.get("type", "point")
-        points = info.get("points", [])
-        data_rows.append({
+        rows.append({
             "category": cat_name,
             "feature": feat,
-            "geometry_type": geom_type,
-            "geometry_points": points
+            "geometry_type": info.get("type", "point"),
+            "geometry_points": info.get("points", [])
         })
-
-# Add each group
-add_category("Meere, Meeresteile und Seen", territory_data["gewässer"]["meere_meeresteile_und_seen"])
-add_category("Flüsse", territory_data["gewässer"]["fluesse"])
-add_category("Inseln/Inselgruppen", territory_data["gewässer"]["inseln_inselgruppen"])
-add_category("Gebirge", territory_data["gewässer"]["gebirge"])
-add_category("Vergessenes", territory_data["gewässer"]["forgotten"])
-
-# NEW: Extra category for forgotten2.json
-add_category("Vergessenes2", territory_data["gewässer"]["forgotten2"])
-
-df = pd.DataFrame(data_rows)
+    return rows
+
+
+def get_data():
+    """Return the feature indexes, loading the JSON files on first use.
+
+    Keys: "rows" (all features in order), "by_category" (category -> rows)
+    and "by_feature" (feature name -> first matching row).
+    """
+    global _data
+    if _data is not None:
+        return _data
+    with _data_lock:
+        if _data is None:
+            with timed_phase("load json"):
+                parsed = [_load_json(path) for _, path in CATEGORY_FILES]
+            with timed_phase("build indexes"):
+                by_category = {cat: _build_rows(cat, cat_data)
+                               for (cat, _), cat_data in zip(CATEGORY_FILES, parsed)}
+                rows = [row for cat in CATEGORIES for row in by_category[cat]]
+                by_feature = {}
+                for row in rows:
+                    by_feature.setdefault(row["feature"], row)
+            _data = {"rows": rows, "by_category": by_category, "by_feature": by_feature}
+    return _data
+
+
+def _go():
+    """Import plotly.graph_objects on first use.
+
+    plotly>=5 loads graph_objects lazily, so the import itself is cheap; the
+    real cost is loading the validators on the first Figure/Scattergeo, which
+    the warm-up logs as its "first figure" phase.
+    """
+    import plotly.graph_objects as go
+    return go
 
 ###############################################################################
 # 3) DASH APP LAYOUT
 ###############################################################################
-app = Dash(__name__, external_stylesheets=[dbc.themes.LUX])
-
-app.layout = dbc.Container([
-    dcc.Store(id="store-mode", data=None),
-    dcc.Store(id="store-selected-category", data=None),
-    dcc.Store(id="store-remaining-features", data=[]),
-    dcc.Store(id="store-selected-feature", data=None),
-    dcc.Store(id="store-correct-count", data=0),
-    dcc.Store(id="store-wrong-count", data=0),
-    dcc.Store(id="store-done-features", data=[]),
-    dcc.Store(id="store-start-time", data=None),
-
-    dbc.NavbarSimple(
-        brand="Geographisches Ratespiel - Blind Map",
-        brand_href="#",
-        color="primary",
-        dark=True,
-        className="mb-4"
-    ),
-
-    # SCREEN 0: Mode Selection
-    dbc.Card(
-        [
-            dbc.CardHeader("Modus auswählen", className="bg-secondary text-white"),
-            dbc.CardBody([
-                dbc.Button("Learning", id="mode-learning-button", n_clicks=0, color="primary", className="me-2"),
-                dbc.Button("Quiz", id="mode-quiz-button", n_clicks=0, color="secondary")
-            ])
-        ],
-        id="mode-selection-card",
-        style={"maxWidth": "600px", "margin": "0 auto 2rem auto", "display": "block"}
-    ),
-
-    # SCREEN 1: Category Selection
-    dbc.Card(
-        [
-            dbc.CardHeader("Kategorie auswählen", className="bg-secondary text-white"),
-            dbc.CardBody([
-                dcc.Dropdown(id="category-dropdown", style={"maxWidth": "300px"}),
-                dbc.Button("Weiter", id="category-next-button", n_clicks=0, color="success", className="mt-3")
-            ])
-        ],
-        id="category-selection-card",
-        style={"maxWidth": "600px", "margin": "0 auto 2rem auto", "display": "none"}
-    ),
-
-    # SCREEN 2A: Quiz
-    dbc.Card(
-        [
-            dbc.CardHeader("Ratespiel", className="bg-secondary text-white"),
-            dbc.CardBody([
-                dbc.Row([
-                    dbc.Col([
-                        html.Label("Welches Feature ist hervorgehoben?", style={"fontWeight": "bold"}),
-                        dcc.Dropdown(id="feature-guess-dropdown", style={"maxWidth": "300px"}),
-                        dbc.Button("Tipp absenden", id="guess-button", n_clicks=0, color="primary", className="mt-2"),
-                        html.Div(id="guess-result", style={"marginTop": "1em", "fontWeight": "bold", "color": "#333"})
-                    ], md=4),
-                    dbc.Col([
-                        dcc.Graph(id="blind-map", style={"height": "500px"})
-                    ], md=8)
-                ]),
-                html.Hr(),
-                html.Div(id="score-display", className="mt-3 text-center"),
-                html.Div(id="lists-display", className="mt-3 text-center"),
-                dbc.Button("Neu starten", id="reset-button", n_clicks=0, color="warning", className="mt-3"),
-                dbc.Button("Zurück zum Menü", id="back-button", n_clicks=0, color="info", className="mt-3")
-            ])
-        ],
-        id="quiz-card",
-        style={"maxWidth": "900px", "margin": "0 auto 2rem auto", "display": "none"}
-    ),
-
-    # SCREEN 2B: Learning
-    dbc.Card(
-        [
-            dbc.CardHeader("Lernmodus", className="bg-secondary text-white"),
-            dbc.CardBody([
-                dcc.Graph(id="learning-map", style={"height": "500px"}),
-                html.Div(id="learning-list", className="mt-3 text-center"),
-                dbc.Button("Zurück zum Menü", id="learning-back-button", n_clicks=0, color="info", className="mt-3")
-            ])
-        ],
-        id="learning-card",
-        style={"maxWidth": "900px", "margin": "0 auto 2rem auto", "display": "none"}
-    )
-], fluid=True)
+with timed_phase("build layout"):
+    app = Dash(__name__, external_stylesheets=[dbc.themes.LUX])
+
+    app.layout = dbc.Container([
+        dcc.Store(id="store-mode", data=None),
+        dcc.Store(id="store-selected-category", data=None),
+        dcc.Store(id="store-remaining-features", data=[]),
+        dcc.Store(id="store-selected-feature", data=None),
+        dcc.Store(id="store-correct-count", data=0),
+        dcc.Store(id="store-wrong-count", data=0),
+        dcc.Store(id="store-done-features", data=[]),
+        dcc.Store(id="store-start-time", data=None),
+
+        dbc.NavbarSimple(
+            brand="Geographisches Ratespiel - Blind Map",
+            brand_href="#",
+            color="primary",
+            dark=True,
+            className="mb-4"
+        ),
+
+        # SCREEN 0: Mode Selection
+        dbc.Card(
+            [
+                dbc.CardHeader("Modus auswählen", className="bg-secondary text-white"),
+                dbc.CardBody([
+                    dbc.Button("Learning", id="mode-learning-button", n_clicks=0, color="primary", className="me-2"),
+                    dbc.Button("Quiz", id="mode-quiz-button", n_clicks=0, color="secondary")
+                ])
+            ],
+            id="mode-selection-card",
+            style={"maxWidth": "600px", "margin": "0 auto 2rem auto", "display": "block"}
+        ),
+
+        # SCREEN 1: Category Selection
+        dbc.Card(
+            [
+                dbc.CardHeader("Kategorie auswählen", className="bg-secondary text-white"),
+                dbc.CardBody([
+                    dcc.Dropdown(id="category-dropdown", style={"maxWidth": "300px"}),
+                    dbc.Button("Weiter", id="category-next-button", n_clicks=0, color="success", className="mt-3")
+                ])
+            ],
+            id="category-selection-card",
+            style={"maxWidth": "600px", "margin": "0 auto 2rem auto", "display": "none"}
+        ),
+
+        # SCREEN 2A: Quiz
+        dbc.Card(
+            [
+                dbc.CardHeader("Ratespiel", className="bg-secondary text-white"),
+                dbc.CardBody([
+                    dbc.Row([
+                        dbc.Col([
+                            html.Label("Welches Feature ist hervorgehoben?", style={"fontWeight": "bold"}),
+                            dcc.Dropdown(id="feature-guess-dropdown", style={"maxWidth": "300px"}),
+                            dbc.Button("Tipp absenden", id="guess-button", n_clicks=0, color="primary", className="mt-2"),
+                            html.Div(id="guess-result", style={"marginTop": "1em", "fontWeight": "bold", "color": "#333"})
+                        ], md=4),
+                        dbc.Col([
+                            dcc.Graph(id="blind-map", style={"height": "500px"})
+                        ], md=8)
+                    ]),
+                    html.Hr(),
+                    html.Div(id="score-display", className="mt-3 text-center"),
+                    html.Div(id="lists-display", className="mt-3 text-center"),
+                    dbc.Button("Neu starten", id="reset-button", n_clicks=0, color="warning", className="mt-3"),
+                    dbc.Button("Zurück zum Menü", id="back-button", n_clicks=0, color="info", className="mt-3")
+                ])
+            ],
+            id="quiz-card",
+            style={"maxWidth": "900px", "margin": "0 auto 2rem auto", "display": "none"}
+        ),
+
+        # SCREEN 2B: Learning
+        dbc.Card(
+            [
+                dbc.CardHeader("Lernmodus", className="bg-secondary text-white"),
+                dbc.CardBody([
+                    dcc.Graph(id="learning-map", style={"height": "500px"}),
+                    html.Div(id="learning-list", className="mt-3 text-center"),
+                    dbc.Button("Zurück zum Menü", id="learning-back-button", n_clicks=0, color="info", className="mt-3")
+                ])
+            ],
+            id="learning-card",
+            style={"maxWidth": "900px", "margin": "0 auto 2rem auto", "display": "none"}
+        )
+    ], fluid=True)
 
 ###############################################################################
 # 4) SINGLE CALLBACK FOR MODE
@@ -327,10 +373,11 @@ def quiz_logic(selected_cat,
         return no_update, no_update, "", correct_count, wrong_count, done_features, remaining_features, no_update, no_update, no_update, start_time
 
     # If "Alle" => gather all features
+    data = get_data()
     if selected_cat == "Alle":
-        cat_feats = df["feature"].tolist()
+        cat_feats = [r["feature"] for r in data["rows"]]
     else:
-        cat_feats = df[df["category"] == selected_cat]["feature"].tolist()
+        cat_feats = [r["feature"] for r in data["by_category"].get(selected_cat, [])]
 
     # Reset scenario
     if not remaining_features or trig_id == "reset-button":
@@ -409,11 +456,8 @@ def quiz_logic(selected_cat,
 ###############################################################################
 # 9) QUIZ MAP (NO-FILL FOR POLYGONS)
 ###############################################################################
-@app.callback(
-    Output("blind-map", "figure"),
-    Input("store-selected-feature", "data")
-)
-def update_quiz_map(selected_feature):
+def _render_quiz_figure(selected_feature):
+    go = _go()
     fig = go.Figure()
     fig.update_layout(
         title="Blind Map - Ratespiel",
@@ -423,12 +467,12 @@ def update_quiz_map(selected_feature):
     if not selected_feature:
         return fig
 
-    row = df[df["feature"] == selected_feature]
-    if row.empty:
+    row = get_data()["by_feature"].get(selected_feature)
+    if row is None:
         return fig
 
-    geom_type = row.iloc[0]["geometry_type"]
-    points = row.iloc[0]["geometry_points"]
+    geom_type = row["geometry_type"]
+    points = row["geometry_points"]
 
     # color for quiz
     color_quiz = "red"
@@ -479,21 +523,35 @@ def update_quiz_map(selected_feature):
 
     return fig
 
+_cached_quiz_figure = lru_cache(maxsize=None)(_render_quiz_figure)
+
+
+def build_quiz_figure(selected_feature):
+    # Store values come from the client; only cache known features so the
+    # cache stays bounded.
+    if selected_feature and selected_feature not in get_data()["by_feature"]:
+        return _render_quiz_figure(selected_feature)
+    return _cached_quiz_figure(selected_feature)
+
+
+@app.callback(
+    Output("blind-map", "figure"),
+    Input("store-selected-feature", "data")
+)
+def update_quiz_map(selected_feature):
+    return build_quiz_figure(selected_feature)
+
 ###############################################################################
 # 10) LEARNING MAP (NO-FILL FOR POLYGONS)
 ###############################################################################
-@app.callback(
-    Output("learning-map", "figure"),
-    Output("learning-list", "children"),
-    Input("store-selected-category", "data")
-)
-def update_learning_map(selected_category):
+def _render_learning_figure(selected_category):
+    go = _go()
     if not selected_category:
-        fig = px.scatter(x=[0], y=[0], title="Bitte Kategorie auswählen")
-        fig.update_layout(height=400)
-        return fig, "Bitte Kategorie auswählen."
+        fig = go.Figure(go.Scatter(x=[0], y=[0], mode="markers"))
+        fig.update_layout(title="Bitte Kategorie auswählen", height=400)
+        return fig
 
-    sub_df = df[df["category"] == selected_category]
+    sub_rows = get_data()["by_category"].get(selected_category, [])
     fig = go.Figure()
     fig.update_layout(
         title=f"Lernmodus: {selected_category}",
@@ -503,7 +561,7 @@ def update_learning_map(selected_category):
 
     color_learn = "blue"
 
-    for _, row_data in sub_df.iterrows():
+    for row_data in sub_rows:
         feat = row_data["feature"]
         gtype = row_data["geometry_type"]
         pts = row_data["geometry_points"]
@@ -572,11 +630,72 @@ def update_learning_map(selected_category):
                 textposition="top center"
             ))
 
-    list_text = "Features: " + ", ".join(sub_df["feature"].tolist())
+    return fig
+
+
+_cached_learning_figure = lru_cache(maxsize=None)(_render_learning_figure)
+
+
+def build_learning_figure(selected_category):
+    # Same as build_quiz_figure: only known categories are cached.
+    if selected_category and selected_category not in CATEGORIES:
+        return _render_learning_figure(selected_category)
+    return _cached_learning_figure(selected_category)
+
+
+@app.callback(
+    Output("learning-map", "figure"),
+    Output("learning-list", "children"),
+    Input("store-selected-category", "data")
+)
+def update_learning_map(selected_category):
+    fig = build_learning_figure(selected_category)
+    if not selected_category:
+        return fig, "Bitte Kategorie auswählen."
+    sub_rows = get_data()["by_category"].get(selected_category, [])
+    list_text = "Features: " + ", ".join(r["feature"] for r in sub_rows)
     return fig, list_text
 
+###############################################################################
+# 11) HEALTH CHECK + BACKGROUND WARM-UP
+###############################################################################
+@app.server.route("/healthz")
+def healthz():
+    # Answers immediately, even while the warm-up is still running
+    return {"status": "ok", "warm": _warm_done.is_set()}
+
+
+def _warm_up():
+    """Load data, then pre-render every figure on the pool."""
+    t = time.perf_counter()
+    try:
+        features = list(get_data()["by_feature"])
+        with timed_phase("first figure"):
+            build_quiz_figure(features[0])
+        with timed_phase("warm figures"):
+            jobs = [_executor.submit(build_learning_figure, cat) for cat in [None] + CATEGORIES]
+            jobs += [_executor.submit(build_quiz_figure, feat) for feat in [None] + features[1:]]
+            for job in jobs:
+                job.result()
+        startup_timings["warm-up total"] = time.perf_counter() - t
+        logger.info("warm-up finished in %.1f ms", startup_timings["warm-up total"] * 1000)
+    except Exception:
+        logger.exception("warm-up failed; figures will be built on first request")
+    finally:
+        _warm_done.set()
+
+
+if not _RELOADER_PARENT:
+    threading.Thread(target=_warm_up, name="warmup-main", daemon=True).start()
+    startup_timings["module loaded"] = time.perf_counter() - _startup_t0
+    logger.info("module loaded after %.1f ms (warm-up continues in background)",
+                startup_timings["module loaded"] * 1000)
+
 ###############################################################################
 # RUN
 ###############################################################################
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=8080)
+    if not _RELOADER_PARENT:
+        logger.info("starting server after %.1f ms (socket is bound next)",
+                    (time.perf_counter() - _startup_t0) * 1000)
+    app.run(debug=DEBUG, host="0.0.0.0", port=8080)